@@ -8,8 +8,11 @@ Génère des rapports détaillés sans modifier aucun fichier
 import os
 import json
 import hashlib
+import argparse
+import multiprocessing
 import subprocess
 import sys
+import tempfile
 from pathlib import Path
 from datetime import datetime
 from typing import Dict, List, Set, Tuple
@@ -108,38 +111,68 @@ def get_all_files(directory: str) -> Set[str]:
     
     return files
 
-def clone_github_repo() -> bool:
+def clone_github_repo(target_dir: str = TEMP_DIR) -> bool:
     """Clone le dépôt GitHub"""
     log("🔄 Clonage du dépôt GitHub...")
     
     # Nettoyer le dossier temporaire
-    if os.path.exists(TEMP_DIR):
-        subprocess.run(['rm', '-rf', TEMP_DIR], check=True)
+    if os.path.exists(target_dir):
+        subprocess.run(['rm', '-rf', target_dir], check=True)
     
     try:
         result = subprocess.run(
-            ['git', 'clone', '--depth', '1', GITHUB_URL, TEMP_DIR],
+            ['git', 'clone', '--depth', '1', GITHUB_URL, target_dir],
             capture_output=True,
             text=True,
             check=True
         )
-        log(f"✅ Dépôt cloné dans {TEMP_DIR}")
+        log(f"✅ Dépôt cloné dans {target_dir}")
         return True
     except subprocess.CalledProcessError as e:
         log(f"❌ Erreur lors du clonage: {e.stderr}")
         return False
 
-def analyze_files() -> Dict:
-    """Analyse et compare tous les fichiers"""
-    log("📂 Analyse de l'environnement Leap...")
-    leap_files = get_all_files(LEAP_DIR)
-    log(f"   Trouvé {len(leap_files)} fichiers dans Leap")
+def get_github_commit(github_dir: str) -> str | None:
+    """Retourne le SHA du commit extrait dans la copie GitHub"""
+    try:
+        result = subprocess.run(
+            ['git', 'rev-parse', 'HEAD'],
+            cwd=github_dir,
+            capture_output=True,
+            text=True,
+            check=True
+        )
+        return result.stdout.strip()
+    except (OSError, subprocess.CalledProcessError) as e:
+        log(f"⚠️  Impossible de lire le commit de {github_dir}: {e}")
+        return None
+
+def shard_of(relative_path: str, shard_count: int) -> int:
+    """Attribue un chemin relatif à un shard (stable entre processus et machines)"""
+    normalized = relative_path.replace(os.sep, '/')
+    digest = hashlib.md5(normalized.encode('utf-8')).hexdigest()
+    return int(digest, 16) % shard_count
+
+def analyze_shard(leap_dir: str, github_dir: str, shard_index: int = 0, shard_count: int = 1,
+                  leap_files: Set[str] | None = None, github_files: Set[str] | None = None) -> Dict:
+    """Analyse et compare les fichiers d'un shard (tous les fichiers si shard_count == 1)
+
+    Les listes de fichiers déjà filtrées pour ce shard peuvent être fournies afin
+    d'éviter de reparcourir les arborescences; sinon elles sont calculées ici.
+    """
+    prefix = f"[shard {shard_index + 1}/{shard_count}] " if shard_count > 1 else ""
+
+    if leap_files is None:
+        log(f"{prefix}📂 Analyse de l'environnement Leap...")
+        leap_files = {f for f in get_all_files(leap_dir) if shard_of(f, shard_count) == shard_index}
+    log(f"{prefix}   Trouvé {len(leap_files)} fichiers dans Leap")
     
-    log("📂 Analyse du dépôt GitHub...")
-    github_files = get_all_files(TEMP_DIR)
-    log(f"   Trouvé {len(github_files)} fichiers dans GitHub")
+    if github_files is None:
+        log(f"{prefix}📂 Analyse du dépôt GitHub...")
+        github_files = {f for f in get_all_files(github_dir) if shard_of(f, shard_count) == shard_index}
+    log(f"{prefix}   Trouvé {len(github_files)} fichiers dans GitHub")
     
-    log("🔍 Comparaison des fichiers...")
+    log(f"{prefix}🔍 Comparaison des fichiers...")
     
     identical = []
     modified = []
@@ -148,12 +181,12 @@ def analyze_files() -> Dict:
     
     # Fichiers communs
     common_files = leap_files & github_files
-    log(f"   {len(common_files)} fichiers communs à comparer")
+    log(f"{prefix}   {len(common_files)} fichiers communs à comparer")
     
     processed = 0
     for filepath in sorted(common_files):
-        leap_path = os.path.join(LEAP_DIR, filepath)
-        github_path = os.path.join(TEMP_DIR, filepath)
+        leap_path = os.path.join(leap_dir, filepath)
+        github_path = os.path.join(github_dir, filepath)
         
         leap_info = get_file_info(leap_path)
         github_info = get_file_info(github_path)
@@ -172,16 +205,18 @@ def analyze_files() -> Dict:
             })
         
         processed += 1
-        if processed % 20 == 0:
+        # Pas de barre de progression en mode shardé: les sorties se mélangeraient
+        if shard_count == 1 and processed % 20 == 0:
             print(f"\r   Progression: {processed}/{len(common_files)}", end='', flush=True)
     
-    print()  # Nouvelle ligne après la progression
+    if shard_count == 1:
+        print()  # Nouvelle ligne après la progression
     
     # Fichiers uniquement dans GitHub
     only_github = sorted(github_files - leap_files)
-    log(f"   {len(only_github)} fichiers uniquement dans GitHub")
+    log(f"{prefix}   {len(only_github)} fichiers uniquement dans GitHub")
     for filepath in only_github:
-        github_path = os.path.join(TEMP_DIR, filepath)
+        github_path = os.path.join(github_dir, filepath)
         info = get_file_info(github_path)
         missing_in_leap.append({
             "file": filepath,
@@ -191,9 +226,9 @@ def analyze_files() -> Dict:
     
     # Fichiers uniquement dans Leap
     only_leap = sorted(leap_files - github_files)
-    log(f"   {len(only_leap)} fichiers uniquement dans Leap")
+    log(f"{prefix}   {len(only_leap)} fichiers uniquement dans Leap")
     for filepath in only_leap:
-        leap_path = os.path.join(LEAP_DIR, filepath)
+        leap_path = os.path.join(leap_dir, filepath)
         info = get_file_info(leap_path)
         missing_in_github.append({
             "file": filepath,
@@ -202,6 +237,8 @@ def analyze_files() -> Dict:
         })
     
     return {
+        "shard_index": shard_index,
+        "shard_count": shard_count,
         "leap_files": leap_files,
         "github_files": github_files,
         "identical": identical,
@@ -210,6 +247,102 @@ def analyze_files() -> Dict:
         "missing_in_github": missing_in_github
     }
 
+def merge_shards(partials: List[Dict], check_provenance: bool = True) -> Dict:
+    """Fusionne les résultats partiels des shards en une analyse complète
+
+    check_provenance vérifie que les shards viennent du même commit GitHub.
+    La racine Leap n'est qu'une étiquette (chemin local à chaque hôte): une
+    différence est signalée mais ne bloque pas la fusion.
+    """
+    if not partials:
+        raise ValueError("Aucun résultat partiel à fusionner")
+    
+    shard_count = partials[0]["shard_count"]
+    indices = sorted(p["shard_index"] for p in partials)
+    if any(p["shard_count"] != shard_count for p in partials):
+        raise ValueError("Les résultats partiels n'ont pas le même nombre de shards")
+    if indices != list(range(shard_count)):
+        raise ValueError(f"Shards manquants ou dupliqués: attendu 0..{shard_count - 1}, reçu {indices}")
+    if check_provenance:
+        commits = {p.get("github_commit") for p in partials}
+        if len(commits) > 1:
+            raise ValueError(f"Les résultats partiels n'ont pas le même commit GitHub: {sorted(map(str, commits))}")
+        if commits == {None}:
+            log("⚠️  Commit GitHub inconnu pour les shards: cohérence des entrées non vérifiable")
+        
+        leap_dirs = {p.get("leap_dir") for p in partials}
+        if len(leap_dirs) > 1:
+            log(f"⚠️  Racines Leap différentes entre shards: {sorted(map(str, leap_dirs))}")
+    
+    log(f"🧩 Fusion de {shard_count} shards...")
+    
+    merged = {
+        "leap_files": set(),
+        "github_files": set(),
+        "identical": [],
+        "modified": [],
+        "missing_in_leap": [],
+        "missing_in_github": []
+    }
+    for partial in partials:
+        merged["leap_files"] |= set(partial["leap_files"])
+        merged["github_files"] |= set(partial["github_files"])
+        for category in ("identical", "modified", "missing_in_leap", "missing_in_github"):
+            merged[category].extend(partial[category])
+    
+    # Même ordre que l'analyse mono-processus: tri par chemin dans chaque catégorie
+    for category in ("identical", "modified", "missing_in_leap", "missing_in_github"):
+        merged[category].sort(key=lambda item: item["file"])
+    
+    return merged
+
+def save_partial(partial: Dict, path: str):
+    """Sauvegarde le résultat partiel d'un shard en JSON"""
+    data = dict(partial)
+    data["leap_files"] = sorted(partial["leap_files"])
+    data["github_files"] = sorted(partial["github_files"])
+    
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+    
+    log(f"✅ Résultat partiel sauvegardé: {path}")
+
+def load_partial(path: str) -> Dict:
+    """Charge le résultat partiel d'un shard"""
+    with open(path, encoding='utf-8') as f:
+        data = json.load(f)
+    data["leap_files"] = set(data["leap_files"])
+    data["github_files"] = set(data["github_files"])
+    return data
+
+def analyze_files(leap_dir: str = LEAP_DIR, github_dir: str = TEMP_DIR, shards: int = 1) -> Dict:
+    """Analyse et compare tous les fichiers, éventuellement répartis sur plusieurs processus"""
+    if shards <= 1:
+        return analyze_shard(leap_dir, github_dir)
+    
+    # Un seul parcours de chaque arborescence, puis répartition des chemins
+    log("📂 Analyse de l'environnement Leap...")
+    leap_files = get_all_files(leap_dir)
+    log("📂 Analyse du dépôt GitHub...")
+    github_files = get_all_files(github_dir)
+    
+    leap_slices = [set() for _ in range(shards)]
+    github_slices = [set() for _ in range(shards)]
+    for filepath in leap_files:
+        leap_slices[shard_of(filepath, shards)].add(filepath)
+    for filepath in github_files:
+        github_slices[shard_of(filepath, shards)].add(filepath)
+    
+    log(f"⚙️  Analyse répartie sur {shards} processus...")
+    with multiprocessing.Pool(processes=shards) as pool:
+        partials = pool.starmap(
+            analyze_shard,
+            [(leap_dir, github_dir, index, shards, leap_slices[index], github_slices[index])
+             for index in range(shards)]
+        )
+    # Tous les shards viennent du même parcours: pas de provenance à vérifier
+    return merge_shards(partials, check_provenance=False)
+
 def generate_json_report(analysis: Dict) -> Dict:
     """Génère le rapport JSON détaillé"""
     log("💾 Génération du rapport JSON...")
@@ -590,30 +723,101 @@ En cas de problème:
     
     log(f"✅ Plan de synchronisation sauvegardé: {SYNC_PLAN}")
 
-def cleanup():
+def cleanup(target_dir: str = TEMP_DIR):
     """Nettoie les fichiers temporaires"""
     log("🧹 Nettoyage des fichiers temporaires...")
-    if os.path.exists(TEMP_DIR):
-        subprocess.run(['rm', '-rf', TEMP_DIR], check=True)
+    if os.path.exists(target_dir):
+        subprocess.run(['rm', '-rf', target_dir], check=True)
     log("✅ Nettoyage terminé")
 
-def main():
+def parse_args(argv: List[str] | None = None) -> argparse.Namespace:
+    """Analyse les arguments de la ligne de commande"""
+    parser = argparse.ArgumentParser(description="Comparaison Leap ↔️ GitHub")
+    parser.add_argument('--leap-dir',
+                        help=f"Racine de l'environnement Leap (défaut: {LEAP_DIR})")
+    parser.add_argument('--github-dir',
+                        help="Copie locale existante du dépôt GitHub (pas de clonage ni de nettoyage)")
+    parser.add_argument('--shards', type=int, default=1,
+                        help="Nombre de processus locaux pour l'analyse (défaut: %(default)s)")
+    parser.add_argument('--shard-index', type=int,
+                        help="Mode worker: index du shard à analyser (0..N-1)")
+    parser.add_argument('--shard-count', type=int,
+                        help="Mode worker: nombre total de shards")
+    parser.add_argument('--partial-output',
+                        help="Mode worker: fichier JSON du résultat partiel")
+    parser.add_argument('--merge', nargs='+', metavar='PARTIAL_JSON',
+                        help="Mode coordinateur: fusionne les résultats partiels et génère les rapports")
+    args = parser.parse_args(argv)
+    
+    worker_args = (args.shard_index, args.shard_count, args.partial_output)
+    if any(a is not None for a in worker_args) and any(a is None for a in worker_args):
+        parser.error("--shard-index, --shard-count et --partial-output vont ensemble")
+    if args.shard_count is not None and not 0 <= args.shard_index < args.shard_count:
+        parser.error("--shard-index doit être compris entre 0 et --shard-count - 1")
+    if args.shards < 1:
+        parser.error("--shards doit être ≥ 1")
+    
+    # Les modes simple/--shards, worker et --merge sont exclusifs
+    worker_mode = args.partial_output is not None
+    if worker_mode and args.shards > 1:
+        parser.error("--shards ne peut pas être combiné avec le mode worker (--partial-output)")
+    if args.merge:
+        conflicts = [
+            flag for flag, used in (
+                ('--shards', args.shards > 1),
+                ('--leap-dir', args.leap_dir is not None),
+                ('--github-dir', args.github_dir is not None),
+                ('--shard-index/--shard-count/--partial-output', worker_mode),
+            ) if used
+        ]
+        if conflicts:
+            parser.error(f"--merge ne peut pas être combiné avec {', '.join(conflicts)}")
+    
+    if args.leap_dir is None:
+        args.leap_dir = LEAP_DIR
+    return args
+
+def main(argv: List[str] | None = None):
     """Fonction principale"""
+    args = parse_args(argv)
+    
     print("\n" + "="*70)
     print("  COMPARAISON LEAP ↔️ GITHUB")
     print("="*70 + "\n")
     
+    clone_dir = None
     try:
-        # Créer le dossier de sortie
-        os.makedirs(OUTPUT_DIR, exist_ok=True)
-        
-        # Cloner le dépôt
-        if not clone_github_repo():
-            log("❌ Impossible de continuer sans le dépôt GitHub")
-            return 1
+        if args.merge:
+            # Mode coordinateur: les shards ont déjà été analysés ailleurs
+            analysis = merge_shards([load_partial(path) for path in args.merge])
+        else:
+            # Cloner le dépôt, sauf si une copie locale est fournie.
+            # Un worker clone dans un dossier qui lui est propre: plusieurs
+            # workers peuvent tourner en même temps sur le même hôte.
+            if not args.github_dir:
+                clone_dir = tempfile.mkdtemp(prefix="github-clone-") if args.partial_output else TEMP_DIR
+                if not clone_github_repo(clone_dir):
+                    log("❌ Impossible de continuer sans le dépôt GitHub")
+                    return 1
+            github_dir = args.github_dir or clone_dir
+            
+            if args.partial_output:
+                # Mode worker: analyse d'un seul shard, pas de rapport
+                try:
+                    partial = analyze_shard(args.leap_dir, github_dir, args.shard_index, args.shard_count)
+                    partial["leap_dir"] = os.path.abspath(args.leap_dir)
+                    partial["github_commit"] = get_github_commit(github_dir)
+                    save_partial(partial, args.partial_output)
+                finally:
+                    if clone_dir:
+                        cleanup(clone_dir)
+                return 0
+            
+            # Analyser les fichiers
+            analysis = analyze_files(args.leap_dir, github_dir, args.shards)
         
-        # Analyser les fichiers
-        analysis = analyze_files()
+        # Créer le dossier de sortie (uniquement pour les modes qui génèrent des rapports)
+        os.makedirs(OUTPUT_DIR, exist_ok=True)
         
         # Générer les rapports
         result = generate_json_report(analysis)
@@ -624,7 +828,8 @@ def main():
             generate_sync_plan(result)
         
         # Nettoyer
-        cleanup()
+        if clone_dir:
+            cleanup(clone_dir)
         
         # Résumé final
         print("\n" + "="*70)
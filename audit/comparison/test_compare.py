@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Vérifications de l'analyse répartie de compare.py
+Usage: python3 -m unittest audit/comparison/test_compare.py
+"""
+
+import contextlib
+import io
+import multiprocessing
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import compare  # noqa: E402
+
+CATEGORIES = ("identical", "modified", "missing_in_leap", "missing_in_github")
+
+
+def write_file(root: str, relative_path: str, content: str):
+    """Crée un fichier (et ses dossiers) dans une arborescence de test"""
+    path = os.path.join(root, relative_path)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(content)
+
+
+class ShardedComparisonTest(unittest.TestCase):
+    """L'analyse répartie doit donner le même résultat qu'une analyse simple"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.leap_dir = os.path.join(self.tmp.name, "leap")
+        self.github_dir = os.path.join(self.tmp.name, "github")
+
+        for i in range(40):
+            relative_path = f"src/module{i % 5}/file{i}.ts"
+            write_file(self.leap_dir, relative_path, f"export const v = {i};\n")
+            write_file(self.github_dir, relative_path, f"export const v = {i};\n")
+        for i in range(0, 40, 7):
+            write_file(self.github_dir, f"src/module{i % 5}/file{i}.ts", "// modifié\n")
+        for i in range(6):
+            write_file(self.github_dir, f"docs/only-github{i}.md", "github\n")
+            write_file(self.leap_dir, f"frontend/only-leap{i}.tsx", "leap\n")
+
+        # Les journaux des analyses ne sont pas utiles dans les tests
+        self.output = self.enterContext(contextlib.redirect_stdout(io.StringIO()))
+
+    def assertSameAnalysis(self, expected, actual):
+        self.assertEqual(expected["leap_files"], actual["leap_files"])
+        self.assertEqual(expected["github_files"], actual["github_files"])
+        for category in CATEGORIES:
+            self.assertEqual(expected[category], actual[category], category)
+
+    def test_local_shards_match_single_run(self):
+        single = compare.analyze_files(self.leap_dir, self.github_dir, 1)
+        sharded = compare.analyze_files(self.leap_dir, self.github_dir, 4)
+
+        self.assertTrue(single["modified"])
+        self.assertTrue(single["missing_in_leap"])
+        self.assertTrue(single["missing_in_github"])
+        self.assertSameAnalysis(single, sharded)
+
+    def test_partial_round_trip_matches_single_run(self):
+        single = compare.analyze_files(self.leap_dir, self.github_dir, 1)
+
+        partials = []
+        for index in reversed(range(3)):
+            path = os.path.join(self.tmp.name, f"shard-{index}.json")
+            compare.save_partial(compare.analyze_shard(self.leap_dir, self.github_dir, index, 3), path)
+            partials.append(compare.load_partial(path))
+
+        self.assertSameAnalysis(single, compare.merge_shards(partials))
+
+    def test_merge_rejects_missing_or_duplicated_shards(self):
+        partials = [compare.analyze_shard(self.leap_dir, self.github_dir, index, 3) for index in range(3)]
+
+        with self.assertRaises(ValueError):
+            compare.merge_shards(partials[:2])
+        with self.assertRaises(ValueError):
+            compare.merge_shards([partials[0], partials[1], partials[1]])
+        with self.assertRaises(ValueError):
+            compare.merge_shards([])
+
+    def test_merge_rejects_mixed_github_commits(self):
+        partials = [compare.analyze_shard(self.leap_dir, self.github_dir, index, 2) for index in range(2)]
+        for partial in partials:
+            partial["leap_dir"] = self.leap_dir
+            partial["github_commit"] = "a" * 40
+
+        partials[1]["github_commit"] = "0" * 40
+        with self.assertRaises(ValueError):
+            compare.merge_shards(partials)
+
+        partials[1]["github_commit"] = None
+        with self.assertRaises(ValueError):
+            compare.merge_shards(partials)
+
+    def test_merge_warns_on_unverifiable_provenance(self):
+        partials = [compare.analyze_shard(self.leap_dir, self.github_dir, index, 2) for index in range(2)]
+        partials[0]["leap_dir"] = "/mnt/leap"
+        partials[1]["leap_dir"] = "/srv/leap"
+
+        compare.merge_shards(partials)
+
+        self.assertIn("Commit GitHub inconnu", self.output.getvalue())
+        self.assertIn("Racines Leap différentes", self.output.getvalue())
+
+    @unittest.skipUnless(shutil.which("git"), "git requis")
+    @unittest.skipUnless("fork" in multiprocessing.get_all_start_methods(), "fork requis")
+    def test_concurrent_workers_on_same_host(self):
+        git = ["git", "-c", "user.name=test", "-c", "user.email=test@example.com"]
+        subprocess.run(git + ["init", "-q"], cwd=self.github_dir, check=True)
+        subprocess.run(git + ["add", "-A"], cwd=self.github_dir, check=True)
+        subprocess.run(git + ["commit", "-q", "-m", "init"], cwd=self.github_dir, check=True)
+
+        # Les workers clonent le dépôt local; TEMP_DIR partagé ne doit jamais servir
+        shared_clone = os.path.join(self.tmp.name, "github-clone")
+        clone_root = os.path.join(self.tmp.name, "clones")
+        os.makedirs(clone_root)
+        for name, value in (("GITHUB_URL", f"file://{self.github_dir}"), ("TEMP_DIR", shared_clone)):
+            self.addCleanup(setattr, compare, name, getattr(compare, name))
+            setattr(compare, name, value)
+        self.addCleanup(setattr, tempfile, "tempdir", tempfile.tempdir)
+        tempfile.tempdir = clone_root
+
+        def run_worker(index):
+            argv = ["--leap-dir", self.leap_dir, "--shard-index", str(index), "--shard-count", "2",
+                    "--partial-output", os.path.join(self.tmp.name, f"shard-{index}.json")]
+            with open(os.path.join(self.tmp.name, f"worker-{index}.log"), 'w', encoding='utf-8') as f:
+                with contextlib.redirect_stdout(f):
+                    code = compare.main(argv)
+            sys.exit(code)
+
+        context = multiprocessing.get_context("fork")
+        workers = [context.Process(target=run_worker, args=(index,)) for index in range(2)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+            self.assertEqual(worker.exitcode, 0)
+
+        merged = compare.merge_shards([
+            compare.load_partial(os.path.join(self.tmp.name, f"shard-{index}.json")) for index in range(2)
+        ])
+        self.assertSameAnalysis(compare.analyze_files(self.leap_dir, self.github_dir, 1), merged)
+        # Chaque worker a cloné dans son propre dossier, supprimé à la fin
+        clone_dirs = set()
+        for index in range(2):
+            with open(os.path.join(self.tmp.name, f"worker-{index}.log"), encoding='utf-8') as f:
+                clone_dirs |= {line.split("Dépôt cloné dans ", 1)[1].strip()
+                               for line in f if "Dépôt cloné dans " in line}
+        self.assertEqual(len(clone_dirs), 2)
+        self.assertTrue(all(os.path.dirname(d) == clone_root for d in clone_dirs))
+        self.assertFalse(os.path.exists(shared_clone))
+        self.assertEqual(os.listdir(clone_root), [])
+
+    def test_conflicting_modes_are_rejected(self):
+        invalid = [
+            ["--merge", "a.json", "--shards", "2"],
+            ["--merge", "a.json", "--leap-dir", "/"],
+            ["--merge", "a.json", "--github-dir", "/tmp"],
+            ["--merge", "a.json", "--shard-index", "0", "--shard-count", "2", "--partial-output", "p.json"],
+            ["--shards", "4", "--shard-index", "0", "--shard-count", "2", "--partial-output", "p.json"],
+        ]
+        for argv in invalid:
+            with self.subTest(argv=argv), contextlib.redirect_stderr(io.StringIO()):
+                with self.assertRaises(SystemExit):
+                    compare.parse_args(argv)
+
+
+if __name__ == "__main__":
+    unittest.main()